@@ -1,5 +1,7 @@
-from collections import namedtuple
+from asyncio import CancelledError, get_event_loop, shield
+from collections import OrderedDict, namedtuple
 from functools import update_wrapper
+from inspect import Parameter, signature
 from typing import Union
 
 ################################################################################
@@ -7,59 +9,64 @@ from typing import Union
 ################################################################################
 
 _CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
-DEFAULT_FAST_TYPES = {int, str}
+_tuple_new = tuple.__new__  # builds a _CacheInfo without the generated __new__
 
 
-class _HashedSeq(list):
-    """
-    This class guarantees that hash() will be called no more than once
-    per element.  This is important because the lru_cache() will hash
-    the key multiple times on a cache miss.
-    """
-
-    __slots__ = 'hash_value'
-
-    def __init__(self, tup):
-        super().__init__()
-        self[:] = tup
-        self.hash_value = hash(tup)
-
-    def __hash__(self):
-        return self.hash_value
-
-    def __eq__(self, other):
-        return super().__eq__(other)
-
-
-def _make_key(args, kwds, typed, kwd_mark=(object(),), fast_types=None):
+def _make_key(args, kwds, typed, kwd_mark=(object(),)):
     """Make a cache key from optionally typed positional and keyword arguments
 
     The key is constructed in a way that is flat as possible rather than
     as a nested structure that would take more memory.
 
     If there is only a single argument and its data type is known to cache
-    its hash value, then that argument is returned without a wrapper.  This
-    saves space and improves lookup speed.
+    its hash value, then that argument is returned as the key itself rather
+    than inside a tuple.  This saves space and improves lookup speed.
 
     """
     # All of code below relies on kwds preserving the order input by the user.
     # Formerly, we sorted() the kwds before looping.  The new way is *much*
     # faster; however, it means that f(x=1, y=2) will now be treated as a
     # distinct call from f(y=2, x=1) which will be cached separately.
-    if fast_types is None:
-        fast_types = DEFAULT_FAST_TYPES
-    key = args
+    if not kwds and not typed:
+        if len(args) == 1:
+            t = type(args[0])
+            if t is int or t is str:
+                return args[0]
+        return args
+    # Collect the key in a single list, concatenating tuples would allocate
+    # a new tuple for every part of the key.
+    key = list(args)
     if kwds:
         key += kwd_mark
         for item in kwds.items():
             key += item
     if typed:
-        key += tuple(type(v) for v in args)
+        key += map(type, args)
         if kwds:
-            key += tuple(type(v) for v in kwds.values())
-    elif len(key) == 1 and type(key[0]) in fast_types:
-        return key[0]
-    return _HashedSeq(key)
+            key += map(type, kwds.values())
+    return tuple(key)
+
+
+def _make_single_arg_key(args, kwds, typed):
+    """Make a cache key for a function that takes a single positional argument
+
+    Positional calls use the arguments tuple itself as the key, skipping all
+    of the checks _make_key has to do.
+
+    """
+    if kwds:
+        return _make_key(args, kwds, typed)
+    return args
+
+
+def _takes_single_arg(user_function):
+    """Check whether the function takes exactly one positional argument"""
+    try:
+        parameters = tuple(signature(user_function).parameters.values())
+    except (TypeError, ValueError):
+        return False
+    return len(parameters) == 1 and parameters[0].kind in (Parameter.POSITIONAL_ONLY,
+                                                             Parameter.POSITIONAL_OR_KEYWORD)
 
 
 def lru_cache(maxsize: Union[int, None] = 128, typed=False):
@@ -110,103 +117,112 @@ def lru_cache(maxsize: Union[int, None] = 128, typed=False):
 
 def _lru_cache_wrapper(user_function, maxsize, typed):
     # Constants shared by all lru cache instances:
-    sentinel = object()  # unique object used to signal cache misses
-    link_prev_field, link_next_field, link_key_field, link_result_field = 0, 1, 2, 3  # names for the link fields
-
-    local_cache = {}
-    hits = misses = 0
-    full = False
-    root = []  # root of the circular doubly linked list
-    root[:] = [root, root, None, None]  # initialize by pointing to self
+    sentinel = object()  # unique object used to signal cache misses and cancelled calls
+    # Specialize the key for the common f(x) signature
+    make_key = _make_single_arg_key if not typed and _takes_single_arg(user_function) else _make_key
+
+    # A bounded cache keeps its keys ordered by recency, least recently used first
+    local_cache = {} if maxsize is None else OrderedDict()
+    cache_get = local_cache.get  # bound method to lookup a key or return a default
+    # Statistics are kept in a list so the wrappers do not rebind closure cells
+    stats = [0, 0, 0]  # hits, misses, currsize
+    pending = {}  # futures of the calls still being awaited, by key
+    pending_get = pending.get
+
+    async def call_user_function(key, args, kwds):
+        # Let concurrent callers with the same key wait for this call
+        future = pending[key] = get_event_loop().create_future()
+        try:
+            result = await user_function(*args, **kwds)
+        except CancelledError:
+            # Only this caller was cancelled, let the waiting callers retry the call
+            future.set_result(sentinel)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve the exception so it is not logged when nobody waits for it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del pending[key]
+        return result
+
+    async def wait_or_call(key, args, kwds):
+        # Wait for a concurrent call with the same key, or make the call
+        future = pending_get(key)
+        while future is not None:
+            result = await shield(future)
+            if result is sentinel:
+                # The caller that made the call was cancelled, another caller
+                # may have made it again and stored its result since.
+                result = cache_get(key, sentinel)
+            if result is not sentinel:
+                stats[0] += 1
+                return result
+            future = pending_get(key)
+        stats[1] += 1
+        return await call_user_function(key, args, kwds)
 
     if maxsize == 0:
         async def wrapper(*args, **kwds):
             # No caching -- just a statistics update
-            nonlocal misses
-            misses += 1
+            stats[1] += 1
             result = await user_function(*args, **kwds)
             return result
 
     elif maxsize is None:
         async def wrapper(*args, **kwds):
             # Simple caching without ordering or size limit
-            nonlocal hits, misses
-            key = _make_key(args, kwds, typed)
-            result = local_cache.get(key, sentinel)
-            if result is not sentinel:
-                hits += 1
+            key = make_key(args, kwds, typed)
+            try:
+                result = local_cache[key]
+            except KeyError:
+                pass
+            else:
+                stats[0] += 1
                 return result
-            misses += 1
-            result = await user_function(*args, **kwds)
-            local_cache[key] = result
+            result = await wait_or_call(key, args, kwds)
+            if key not in local_cache:
+                local_cache[key] = result
+                stats[2] += 1
             return result
 
     else:
+        move_to_end = local_cache.move_to_end
+        popitem = local_cache.popitem
+
         async def wrapper(*args, **kwds):
             # Size limited caching that tracks accesses by recency
-            nonlocal root, hits, misses, full
-            key = _make_key(args, kwds, typed)
-            link = local_cache.get(key)
-            if link is not None:
-                # Move the link to the front of the circular queue
-                link_prev, link_next, _key, result = link
-                link_prev[link_next_field] = link_next
-                link_next[link_prev_field] = link_prev
-                last = root[link_prev_field]
-                last[link_next_field] = root[link_prev_field] = link
-                link[link_prev_field] = last
-                link[link_next_field] = root
-                hits += 1
+            key = make_key(args, kwds, typed)
+            result = cache_get(key, sentinel)
+            if result is not sentinel:
+                # Mark the key as the most recently used
+                move_to_end(key)
+                stats[0] += 1
                 return result
-            misses += 1
-            result = await user_function(*args, **kwds)
+            result = await wait_or_call(key, args, kwds)
             if key in local_cache:
-                # Getting here means that this same key was added to the
-                # cache while the lock was released.  Since the link
-                # update is already done, we need only return the
-                # computed result and update the count of misses.
-                pass
-            elif full:
-                # Use the old root to store the new key and result.
-                old_root = root
-                old_root[link_key_field] = key
-                old_root[link_result_field] = result
-                # Empty the oldest link and make it the new root.
-                # Keep a reference to the old key and old result to
-                # prevent their ref counts from going to zero during the
-                # update. That will prevent potentially arbitrary object
-                # clean-up code (i.e. __del__) from running while we're
-                # still adjusting the links.
-                root = old_root[link_next_field]
-                old_key = root[link_key_field]
-                root[link_key_field] = root[link_result_field] = None
-                # Now update the cache dictionary.
-                del local_cache[old_key]
-                # Save the potentially reentrant cache[key] assignment
-                # for last, after the root and links have been put in
-                # a consistent state.
-                local_cache[key] = old_root
+                # A concurrent call with the same key already stored the result
+                move_to_end(key)
+                return result
+            local_cache[key] = result
+            if stats[2] >= maxsize:
+                # Evict the least recently used key, the size is unchanged
+                popitem(last=False)
             else:
-                # Put result in a new link at the front of the queue.
-                last = root[link_prev_field]
-                link = [last, root, key, result]
-                last[link_next_field] = root[link_prev_field] = local_cache[key] = link
-                # Use the cache_len bound method instead of the len() function
-                # which could potentially be wrapped in an lru_cache itself.
-                full = (len(local_cache) >= maxsize)
+                stats[2] += 1
             return result
 
     def cache_info():
         """ Report cache statistics """
-        return _CacheInfo(hits, misses, maxsize, len(local_cache))
+        return _tuple_new(_CacheInfo, (stats[0], stats[1], maxsize, stats[2]))
 
     def cache_clear():
         """ Clear the cache and cache statistics """
-        nonlocal hits, misses, full
         local_cache.clear()
-        root[:] = [root, root, None, None]
-        hits = misses = 0
-        full = False
+        stats[:] = [0, 0, 0]
 
     wrapper.cache_info = cache_info
     wrapper.cache_clear = cache_clear
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from asyncio_cache import cache
@@ -36,3 +38,42 @@ async def test_clear_caching():
     counter.call.cache_clear()
     assert await counter.call(3) == 'called'
     assert counter.count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_coalesced():
+    calls = []
+
+    @cache
+    async def call(arg):
+        calls.append(arg)
+        await asyncio.sleep(0)
+        return arg * 2
+
+    assert await asyncio.gather(call(5), call(5)) == [10, 10]
+    assert calls == [5]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_finished_by_new_caller():
+    calls = []
+    event = asyncio.Event()
+
+    @cache
+    async def call(arg):
+        calls.append(arg)
+        if calls.count(arg) == 1:
+            await event.wait()
+        return arg * 2
+
+    first = asyncio.ensure_future(call(3))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(call(3))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    # A new caller makes the call again before the waiting caller wakes up.
+    assert await call(3) == 6
+    assert await second == 6
+    assert calls == [3, 3]
+    assert call.cache_info().currsize == 1
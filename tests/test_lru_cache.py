@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from asyncio_cache import lru_cache
@@ -41,3 +43,137 @@ async def test_invalidate_cache():
     # Check that a recently used block is cached.
     assert await counter.call(0) == 'called'
     assert counter.count == cache_info.maxsize + 2
+
+
+@pytest.mark.asyncio
+async def test_single_argument_function():
+    calls = []
+
+    @lru_cache
+    async def call(arg):
+        calls.append(arg)
+        return arg * 2
+
+    assert await call(3) == 6
+    assert await call(3) == 6
+    assert await call(arg=3) == 6
+    assert await call(4) == 8
+    assert calls == [3, 3, 4]
+    with pytest.raises(TypeError):
+        await call(3, 4)
+
+
+@pytest.mark.asyncio
+async def test_cache_info():
+    counter = CallsCounter()
+    counter.call.cache_clear()
+    await counter.call(1)
+    await counter.call(1)
+    await counter.call(2)
+    cache_info = counter.call.cache_info()
+    assert (cache_info.hits, cache_info.misses, cache_info.currsize) == (1, 2, 2)
+    counter.call.cache_clear()
+    assert counter.call.cache_info() == (0, 0, 128, 0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_coalesced():
+    calls = []
+
+    @lru_cache
+    async def call(arg):
+        calls.append(arg)
+        await asyncio.sleep(0)
+        return arg * 2
+
+    assert await asyncio.gather(call(3), call(3), call(4)) == [6, 6, 8]
+    assert calls == [3, 4]
+    assert call.cache_info().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_exception_not_cached():
+    calls = []
+
+    @lru_cache
+    async def call(arg):
+        calls.append(arg)
+        await asyncio.sleep(0)
+        raise ValueError(arg)
+
+    results = await asyncio.gather(call(3), call(3), return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    with pytest.raises(ValueError):
+        await call(3)
+    assert calls == [3, 3]
+    assert call.cache_info().hits == 0
+
+
+@pytest.mark.asyncio
+async def test_typed():
+    calls = []
+
+    @lru_cache(typed=True)
+    async def call(arg, other=None):
+        calls.append(arg)
+        return arg
+
+    assert await call(3) == 3
+    assert await call(3.0) == 3.0
+    assert await call(3, other=1) == 3
+    assert await call(3, other=1.0) == 3
+    assert await call(3) == 3
+    assert calls == [3, 3.0, 3, 3]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_retried_by_waiter():
+    calls = []
+    event = asyncio.Event()
+
+    @lru_cache
+    async def call(arg):
+        calls.append(arg)
+        await event.wait()
+        return arg * 2
+
+    first = asyncio.ensure_future(call(3))
+    second = asyncio.ensure_future(call(3))
+    await asyncio.sleep(0)
+    first.cancel()
+    event.set()
+    results = await asyncio.gather(first, second, return_exceptions=True)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1] == 6
+    assert calls == [3, 3]
+    cache_info = call.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (0, 2)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_finished_by_new_caller():
+    calls = []
+    event = asyncio.Event()
+
+    @lru_cache(maxsize=2)
+    async def call(arg):
+        calls.append(arg)
+        if calls.count(arg) == 1:
+            await event.wait()
+        return arg * 2
+
+    event.set()
+    assert await call(100) == 200
+    event.clear()
+    first = asyncio.ensure_future(call(3))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(call(3))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    # A new caller makes the call again before the waiting caller wakes up.
+    assert await call(3) == 6
+    assert await second == 6
+    assert await call(100) == 200
+    assert calls == [100, 3, 3]
+    assert call.cache_info().currsize == 2